@@ -1,14 +1,59 @@
 #!/usr/bin/env python3
 
+import os
 import subprocess
 import sys
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Generator, Iterator, List, Optional, Set, Tuple
+
+try:
+    import pygit2
+except ImportError:  # optional dependency, fall back to the git CLI
+    # Typed as the module so pygit2.Repository etc. stay usable in annotations;
+    # every use is behind _use_pygit2, which is False when this is None
+    pygit2 = None  # type: ignore[assignment]
+
+# Layout of git's %(committerdate:iso8601) / %ci dates, e.g. "2025-11-21 23:25:02 +0500"
+_GIT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S %z"
+
+# Keep git from allocating a console window for every call on Windows
+_CREATION_FLAGS = 0
+if sys.platform == 'win32':
+    _CREATION_FLAGS = subprocess.CREATE_NO_WINDOW
+
+# Below this many branches to walk, starting worker processes is assumed to cost
+# more than it saves. This is an unmeasured estimate, not a benchmarked break-even.
+_PROCESS_POOL_MIN_BRANCHES = 16
+
+# ProcessPoolExecutor rejects more than 61 workers on Windows
+_MAX_PROCESS_WORKERS = 61 if sys.platform == 'win32' else None
+
+# dataclass(slots=True) needs Python 3.10; older interpreters get a regular dataclass
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _subject(message: str) -> str:
+    """
+    Format a commit message's subject the way git's %s does: the lines of the
+    first paragraph, trailing whitespace removed, joined by single spaces.
+    """
+    lines: List[str] = []
+    for line in message.splitlines():
+        line = line.rstrip()
+        if line:
+            lines.append(line)
+        elif lines:
+            break
+    return ' '.join(lines)
 
 
 def relative_date(dt: datetime) -> str:
     """Convert datetime to human-readable relative string like '15 days ago'."""
-    now = datetime.now()
+    now = datetime.now(dt.tzinfo)
     diff = now - dt
 
     seconds = diff.total_seconds()
@@ -49,6 +94,28 @@ def relative_date(dt: datetime) -> str:
         return f"{years} years ago"
 
 
+@dataclass(**_DATACLASS_SLOTS)
+class BranchInfo:
+    """A recent remote branch, filled in with its unmerged commits by analyze."""
+
+    name: str
+    full_name: str
+    date: datetime
+    date_str: str
+    sha: Optional[str] = None
+    unmerged_commits: Optional[int] = None
+    contributors: Optional[List[str]] = None
+    commit_details: Optional[List[Dict]] = None
+
+    def to_dict(self) -> Dict:
+        """Convert to the dictionary form used by the public API, leaving out fields never collected."""
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if getattr(self, f.name) is not None
+        }
+
+
 class GitUnmerged:
     """Analyze git branches to find unmerged commits."""
 
@@ -68,133 +135,310 @@ class GitUnmerged:
         self.ignore_pattern = ignore_pattern
         self.days = days
 
-    def run_git_command(self, cmd: str) -> str:
-        """Run a git command and return the output."""
+        # Point git at the repository with -C rather than chdir'ing the child
+        self._git_base = ["git", "-C", repo_path]
+
+        # Read-only queries go through libgit2 in-process when pygit2 is installed
+        self._local = threading.local()
+        self._use_pygit2 = False
+        if pygit2 is not None:
+            try:
+                self._pygit2_repository()
+                self._use_pygit2 = True
+            except pygit2.GitError:
+                pass
+
+        # Branch info is a pure function of the two commits compared, so it is
+        # cached by (base sha, branch sha) and can never go stale
+        self._branch_info_cache: Dict[Tuple[str, str], Tuple[int, List[str], List[Dict]]] = {}
+
+    def run_git_command(self, argv: List[str]) -> str:
+        """Run a git command given as an argument list and return the output."""
         try:
             result = subprocess.run(
-                cmd,
-                cwd=self.repo_path,
+                argv,
                 capture_output=True,
                 text=True,
-                shell=True
+                creationflags=_CREATION_FLAGS
             )
             return result.stdout.strip()
         except Exception as e:
             print(f"Error running command: {e}", file=sys.stderr)
             return ""
 
+    def run_git_command_lines(self, argv: List[str]) -> Generator[str, None, None]:
+        """Run a git command and yield its output line by line as git produces it."""
+        try:
+            proc = subprocess.Popen(
+                argv,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                creationflags=_CREATION_FLAGS
+            )
+        except Exception as e:
+            print(f"Error running command: {e}", file=sys.stderr)
+            return
+
+        # Leaving the block closes the pipe, which also stops git if the
+        # caller abandons the iterator early
+        with proc:
+            assert proc.stdout is not None
+            for line in proc.stdout:
+                yield line.rstrip('\n')
+
+    def _pygit2_repository(self) -> "pygit2.Repository":
+        """Get this thread's pygit2 handle, since libgit2 objects must not be shared across threads."""
+        repo = getattr(self._local, 'repo', None)
+        if repo is None:
+            repo = self._local.repo = pygit2.Repository(self.repo_path)
+        return repo
+
+    def _iter_remote_branches(self) -> Generator[Tuple[str, str, datetime, str], None, None]:
+        """Yield (branch name, sha, commit date, date string) for origin's branches, newest first."""
+        # Get origin's branches newest first, so reading can stop at the first stale one
+        lines = self.run_git_command_lines(self._git_base + [
+            "for-each-ref", "--sort=-committerdate",
+            "--format=%(refname:short)%1f%(objectname)%1f%(committerdate:iso8601)", "refs/remotes/origin"
+        ])
+
+        # Closing the stream stops git if the caller broke out early. Fields
+        # are split on \x1f, which, unlike '|', git refuses in a ref name
+        with closing(lines):
+            for line in lines:
+                parts = line.split('\x1f')
+                if len(parts) != 3:
+                    continue
+                branch_name, sha, date_str = parts
+
+                # Skip origin itself and non-branch refs
+                if branch_name == 'origin' or 'HEAD' in branch_name:
+                    continue
+
+                # Parse date, keeping git's timezone offset
+                try:
+                    commit_date = datetime.strptime(date_str, _GIT_DATE_FORMAT)
+                except ValueError:
+                    continue
+
+                yield branch_name, sha, commit_date, date_str
+
+    def _iter_remote_branches_pygit2(self) -> Generator[Tuple[str, str, datetime, str], None, None]:
+        """Same as _iter_remote_branches, read through pygit2."""
+        repo = self._pygit2_repository()
+
+        remote_branches = []
+        for refname in repo.listall_references():
+            if not refname.startswith('refs/remotes/origin/'):
+                continue
+
+            # Skip non-branch refs
+            branch_name = refname[len('refs/remotes/'):]
+            if 'HEAD' in branch_name:
+                continue
+
+            try:
+                commit = repo.lookup_reference(refname).peel(pygit2.Commit)
+            except (KeyError, ValueError, pygit2.GitError):
+                continue
+
+            tz = timezone(timedelta(minutes=commit.commit_time_offset))
+            commit_date = datetime.fromtimestamp(commit.commit_time, tz)
+            date_str = commit_date.strftime(_GIT_DATE_FORMAT)
+            remote_branches.append((branch_name, str(commit.id), commit_date, date_str))
+
+        remote_branches.sort(key=lambda x: x[2], reverse=True)
+        yield from remote_branches
+
     def get_recent_branches(self) -> List[Dict]:
         """Get all branches with commits in the last N days."""
-        cutoff_date = datetime.now() - timedelta(days=self.days)
+        return [branch.to_dict() for branch in self._recent_branches()]
 
-        # Get all remote branches with their last commit dates
-        cmd = 'git branch -r --format="%(refname:short)|%(committerdate:iso8601)"'
-        output = self.run_git_command(cmd)
+    def _recent_branches(self) -> List[BranchInfo]:
+        """Same as get_recent_branches, as BranchInfo records."""
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.days)
+
+        if self._use_pygit2:
+            remote_branches = self._iter_remote_branches_pygit2()
+        else:
+            remote_branches = self._iter_remote_branches()
 
         branches = []
-        for line in output.split('\n'):
-            if not line:
-                continue
+        with closing(remote_branches):
+            for branch_name, sha, commit_date, date_str in remote_branches:
+                # Apply ignore pattern
+                if self.ignore_pattern and self.ignore_pattern in branch_name:
+                    continue
+
+                # Every remaining branch is older still
+                if commit_date < cutoff_date:
+                    break
+
+                # Remove 'origin/' prefix
+                clean_name = branch_name.replace('origin/', '')
+                branches.append(BranchInfo(
+                    name=clean_name,
+                    full_name=branch_name,
+                    date=commit_date,
+                    date_str=date_str,
+                    sha=sha
+                ))
 
-            # Apply ignore pattern
-            if self.ignore_pattern and self.ignore_pattern in line:
-                continue
+        return branches
 
-            parts = line.split('|')
-            if len(parts) != 2:
-                continue
+    def _iter_unmerged_commits(self, tip: str, base: str) -> Generator[Tuple[str, str, str, str, str], None, None]:
+        """Yield (hash, author name, author email, subject, date) for each commit in tip but not base."""
+        lines = self.run_git_command_lines(
+            self._git_base + ["log", f"{base}..{tip}", "--format=%h%x00%an%x00%ae%x00%ci%x00%s"]
+        )
+
+        for line in lines:
+            # git keeps names and emails as C strings, so NUL cannot occur in
+            # them; the subject comes last so that, should one ever hold a NUL,
+            # it stays whole. Every line is one commit and must be counted, so
+            # a short line is padded rather than dropped.
+            commit_hash, author_name, author_email, date, subject = (line.split('\0', 4) + [''] * 4)[:5]
+            yield commit_hash, author_name, author_email, subject, date
+
+    def _walk_unmerged_pygit2(self, tip: str, base: str) -> Iterator["pygit2.Commit"]:
+        """Walk the commits in tip but not in base through pygit2."""
+        repo = self._pygit2_repository()
+        try:
+            tip_commit = repo.revparse_single(tip).peel(pygit2.Commit)
+            base_commit = repo.revparse_single(base).peel(pygit2.Commit)
+        except (KeyError, ValueError, pygit2.GitError):
+            return iter(())
+
+        # Same order as git log: newest first, children before parents
+        walker = repo.walk(tip_commit.id, pygit2.enums.SortMode.TOPOLOGICAL | pygit2.enums.SortMode.TIME)
+        walker.hide(base_commit.id)
+        return walker
+
+    def _iter_unmerged_commits_pygit2(self, tip: str,
+                                      base: str) -> Generator[Tuple[str, str, str, str, str], None, None]:
+        """Same as _iter_unmerged_commits, read through pygit2."""
+        for commit in self._walk_unmerged_pygit2(tip, base):
+            tz = timezone(timedelta(minutes=commit.commit_time_offset))
+            date = datetime.fromtimestamp(commit.commit_time, tz).strftime(_GIT_DATE_FORMAT)
+            yield commit.short_id, commit.author.name, commit.author.email, _subject(commit.message), date
+
+    def _collect_branch_info(self, tip: str, base: Optional[str] = None) -> Tuple[int, List[str], List[Dict]]:
+        """
+        Collect unmerged commit count, contributors and commit details in one pass.
 
-            branch_name = parts[0].strip()
-            date_str = parts[1].strip()
+        Args:
+            tip: Remote branch name as returned by get_recent_branches (e.g. origin/feature/x) or a commit sha
+            base: Revision to compare against (default: base_branch)
 
-            # Skip origin itself and non-branch refs
-            if branch_name == 'origin' or 'HEAD' in branch_name:
-                continue
+        Returns:
+            Tuple of (unmerged commit count, unique contributors, commit details)
+        """
+        base = base or self.base_branch
+        if self._use_pygit2:
+            unmerged_commits = self._iter_unmerged_commits_pygit2(tip, base)
+        else:
+            unmerged_commits = self._iter_unmerged_commits(tip, base)
+
+        commits = [
+            {
+                'hash': commit_hash,
+                'author_name': author_name,
+                'author_email': author_email,
+                'subject': subject,
+                'date': date
+            }
+            for commit_hash, author_name, author_email, subject, date in unmerged_commits
+        ]
 
-            # Parse date
-            try:
-                # Handle timezone more flexibly - just parse the date/time part
-                date_part = date_str.split(' ')[0] + ' ' + date_str.split(' ')[1]
-                commit_date = datetime.fromisoformat(date_part)
-                if commit_date >= cutoff_date:
-                    # Remove 'origin/' prefix
-                    clean_name = branch_name.replace('origin/', '')
-                    branches.append({
-                        'name': clean_name,
-                        'full_name': branch_name,
-                        'date': commit_date,
-                        'date_str': date_str
-                    })
-            except Exception:
-                continue
+        # Get unique contributors while preserving order
+        contributors = list(dict.fromkeys(
+            f"{commit['author_name']} <{commit['author_email']}>" for commit in commits
+        ))
 
-        return branches
+        return len(commits), contributors, commits
 
-    def get_unmerged_commits(self, branch_name: str) -> int:
-        """Get the number of commits in branch that are not in base_branch."""
-        # Handle both origin/ prefixed and non-prefixed branch names
-        remote_branch = f"origin/{branch_name}" if not branch_name.startswith('origin/') else branch_name
-        cmd = f"git log {self.base_branch}..{remote_branch} --oneline"
-        output = self.run_git_command(cmd)
+    def get_unmerged_commits(self, full_name: str) -> int:
+        """Get the number of commits in a remote branch (e.g. origin/feature/x) that are not in base_branch."""
+        if self._use_pygit2:
+            return sum(1 for _ in self._walk_unmerged_pygit2(full_name, self.base_branch))
 
-        if not output:
-            return 0
+        # Let git do the counting and hand back a single number
+        output = self.run_git_command(
+            self._git_base + ["rev-list", "--count", f"{self.base_branch}..{full_name}"]
+        )
 
-        return len(output.split('\n'))
+        return int(output) if output.isdigit() else 0
 
-    def get_unmerged_commit_details(self, branch_name: str) -> List[Dict]:
-        """Get detailed information about unmerged commits."""
-        # Handle both origin/ prefixed and non-prefixed branch names
-        remote_branch = f"origin/{branch_name}" if not branch_name.startswith('origin/') else branch_name
-        cmd = f'git log {self.base_branch}..{remote_branch} --format="%h|%an|%ae|%s|%ci"'
-        output = self.run_git_command(cmd)
+    def get_unmerged_commit_details(self, full_name: str) -> List[Dict]:
+        """Get detailed information about unmerged commits in a remote branch."""
+        return self._collect_branch_info(full_name)[2]
 
-        if not output:
-            return []
+    def get_contributors(self, full_name: str) -> List[str]:
+        """Get unique contributors (authors) for unmerged commits in a remote branch."""
+        return self._collect_branch_info(full_name)[1]
 
-        commits = []
-        for line in output.split('\n'):
-            if not line:
-                continue
-            parts = line.split('|')
-            if len(parts) == 5:
-                commits.append({
-                    'hash': parts[0],
-                    'author_name': parts[1],
-                    'author_email': parts[2],
-                    'subject': parts[3],
-                    'date': parts[4]
-                })
-
-        return commits
-
-    def get_contributors(self, branch_name: str) -> List[str]:
-        """Get unique contributors (authors) for unmerged commits in a branch."""
-        # Handle both origin/ prefixed and non-prefixed branch names
-        remote_branch = f"origin/{branch_name}" if not branch_name.startswith('origin/') else branch_name
-        cmd = f'git log {self.base_branch}..{remote_branch} --format="%an <%ae>"'
-        output = self.run_git_command(cmd)
-
-        if not output:
-            return []
+    def _resolve_commit(self, ref: str) -> Optional[str]:
+        """Get the sha of the commit ref points to, or None if it does not resolve."""
+        if self._use_pygit2:
+            try:
+                return str(self._pygit2_repository().revparse_single(ref).peel(pygit2.Commit).id)
+            except (KeyError, ValueError, pygit2.GitError):
+                return None
 
-        # Get unique contributors while preserving order
-        contributors = []
-        seen = set()
-        for line in output.split('\n'):
-            if line and line not in seen:
-                contributors.append(line)
-                seen.add(line)
+        output = self.run_git_command(self._git_base + ["rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"])
+        return output or None
+
+    def get_merged_branches(self) -> Set[str]:
+        """Get the remote branches whose tips are already contained in base_branch."""
+        # One for-each-ref answers this for every branch, so merged branches
+        # never need a git log of their own
+        output = self.run_git_command(
+            self._git_base + ["for-each-ref", f"--merged={self.base_branch}", "--format=%(refname:short)", "refs/remotes"]
+        )
+
+        return {line for line in output.split('\n') if line}
 
-        return contributors
+    def fetch_remote(self, quiet: bool = True, remote: str = "origin") -> None:
+        """
+        Fetch latest branches from remote.
 
-    def fetch_remote(self, quiet: bool = True) -> None:
-        """Fetch latest changes from remote."""
-        cmd = "git fetch --all" + (" --quiet" if quiet else "")
-        self.run_git_command(cmd)
+        Args:
+            quiet: Whether to suppress git's progress output (default: True)
+            remote: Remote to fetch from (default: origin)
+        """
+        self._finish_fetch(self._start_fetch(quiet, remote), remote)
+
+    def _start_fetch(self, quiet: bool = True, remote: str = "origin") -> Optional[subprocess.Popen]:
+        """Start fetching latest branches from remote without waiting for it."""
+        # Only branches are analyzed, so skip tags and other remotes entirely
+        argv = self._git_base + ["fetch", "--prune", "--no-tags", "--jobs=8", remote]
+        if quiet:
+            argv.append("--quiet")
+
+        try:
+            return subprocess.Popen(
+                argv,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                creationflags=_CREATION_FLAGS
+            )
+        except Exception as e:
+            print(f"Error running command: {e}", file=sys.stderr)
+            return None
+
+    def _finish_fetch(self, proc: Optional[subprocess.Popen], remote: str) -> None:
+        """Wait for a fetch started by _start_fetch, warning if it failed."""
+        if proc is None:
+            return
+
+        _, stderr = proc.communicate()
+        if proc.returncode != 0:
+            print(f"Warning: fetching from {remote} failed, using local branches: {stderr.strip()}",
+                  file=sys.stderr)
 
     def analyze(self, fetch: bool = True, include_contributors: bool = True,
-                include_commit_details: bool = False) -> List[Dict]:
+                include_commit_details: bool = False, max_workers: Optional[int] = None) -> List[Dict]:
         """
         Analyze branches and return unmerged ones.
 
@@ -202,37 +446,162 @@ class GitUnmerged:
             fetch: Whether to fetch from remote first (default: True)
             include_contributors: Whether to include contributor information (default: True)
             include_commit_details: Whether to include detailed commit information (default: False)
+            max_workers: Number of branches to process concurrently; 1 processes them
+                one after another (default: sized from the CPU count)
+
+        With pygit2 installed, many branches are walked in worker processes.
+        Where those are started with "spawn" (Windows, macOS), each worker
+        re-imports the calling script, so scripts calling this must guard their
+        entry point with ``if __name__ == "__main__":``.
+
+        Raises:
+            ValueError: If max_workers is less than 1
 
         Returns:
             List of dictionaries containing branch information
         """
-        if fetch:
-            self.fetch_remote()
+        unmerged_branches = self.analyze_branches(
+            fetch=fetch,
+            include_contributors=include_contributors,
+            include_commit_details=include_commit_details,
+            max_workers=max_workers
+        )
+        return [branch.to_dict() for branch in unmerged_branches]
+
+    def analyze_branches(self, fetch: bool = True, include_contributors: bool = True,
+                         include_commit_details: bool = False,
+                         max_workers: Optional[int] = None) -> List[BranchInfo]:
+        """Same as analyze, returning BranchInfo records instead of dictionaries."""
+        if max_workers is not None and max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
 
-        recent_branches = self.get_recent_branches()
+        if fetch:
+            fetch_proc = self._start_fetch()
+            # While the network is busy, analyze the refs we already have. That
+            # result is discarded, but it fills the cache, which is keyed by
+            # commit: branches the fetch leaves alone are then not walked again,
+            # and anything it moves is simply a cache miss below. This is a bet
+            # that the base stays put: every entry is keyed by the base too, so
+            # a fetch that moves the base means every branch is walked twice.
+            # The first walk then costs wall time only where it outlasts the
+            # download, but its CPU is spent for nothing.
+            self._analyze_local_refs(include_contributors, include_commit_details, max_workers)
+            self._finish_fetch(fetch_proc, "origin")
+
+        return self._analyze_local_refs(include_contributors, include_commit_details, max_workers)
+
+    def _analyze_local_refs(self, include_contributors: bool, include_commit_details: bool,
+                            max_workers: Optional[int] = None) -> List[BranchInfo]:
+        """Analyze the remote-tracking branches as they currently are, without fetching."""
+        recent_branches = self._recent_branches()
+        merged_branches = self.get_merged_branches()
+        base_sha = self._resolve_commit(self.base_branch)
 
         # Extract base branch name without origin/ prefix
         base_branch_name = self.base_branch.replace('origin/', '')
 
-        unmerged_branches = []
-        for branch in recent_branches:
-            # Skip the base branch itself
-            if branch['name'] == base_branch_name:
-                continue
-
-            unmerged_count = self.get_unmerged_commits(branch['name'])
-            if unmerged_count > 0:
-                branch['unmerged_commits'] = unmerged_count
-
-                if include_contributors:
-                    branch['contributors'] = self.get_contributors(branch['name'])
+        # Skip the base branch itself and anything already merged into it
+        candidates = [
+            branch for branch in recent_branches
+            if branch.name != base_branch_name and branch.full_name not in merged_branches
+        ]
+
+        def process(branch):
+            return self._process_branch(branch, base_sha, include_contributors, include_commit_details)
+
+        if max_workers == 1:
+            results = [process(branch) for branch in candidates]
+        elif self._use_pygit2 and base_sha:
+            # libgit2 walks hold the GIL, so they are spread over processes up
+            # front; processing each branch is then just a cache lookup
+            self._walk_in_processes(candidates, base_sha, max_workers)
+            results = [process(branch) for branch in candidates]
+        else:
+            # Each branch costs a git subprocess; threads release the GIL
+            # while waiting on them, so the branches are processed concurrently.
+            if max_workers is None:
+                max_workers = min(32, (os.cpu_count() or 4) * 2)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(process, candidates))
 
-                if include_commit_details:
-                    branch['commit_details'] = self.get_unmerged_commit_details(branch['name'])
+        unmerged_branches = [branch for branch in results if branch is not None]
 
-                unmerged_branches.append(branch)
+        # Entries for another base or for commits no branch points at any more
+        # cannot be hit again, so they are dropped to keep the cache bounded
+        live_keys = {(base_sha, branch.sha) for branch in candidates}
+        for key in [key for key in self._branch_info_cache if key not in live_keys]:
+            del self._branch_info_cache[key]
 
         # Sort by date (most recent first)
-        unmerged_branches.sort(key=lambda x: x['date'], reverse=True)
+        unmerged_branches.sort(key=lambda x: x.date, reverse=True)
 
         return unmerged_branches
+
+    def _walk_in_processes(self, branches: List[BranchInfo], base_sha: str,
+                           max_workers: Optional[int] = None) -> None:
+        """Fill the branch info cache for branches by walking them in worker processes."""
+        shas = [
+            branch.sha for branch in branches
+            if branch.sha and (base_sha, branch.sha) not in self._branch_info_cache
+        ]
+        if len(shas) < _PROCESS_POOL_MIN_BRANCHES:
+            return
+
+        # Imported here since multiprocessing is costly to load and only this path needs it
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Each worker opens its own repository handle once, in its initializer;
+        # starting more workers than there are branches would only add idle ones
+        max_workers = min(max_workers or os.cpu_count() or 1, len(shas))
+        if _MAX_PROCESS_WORKERS is not None:
+            max_workers = min(max_workers, _MAX_PROCESS_WORKERS)
+        chunksize = max(1, len(shas) // (4 * max_workers))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_walk_worker,
+                                 initargs=(self.repo_path,)) as executor:
+            infos = executor.map(_walk_in_worker, shas, [base_sha] * len(shas), chunksize=chunksize)
+            for sha, info in zip(shas, infos):
+                self._branch_info_cache[(base_sha, sha)] = info
+
+    def _process_branch(self, branch: BranchInfo, base_sha: Optional[str], include_contributors: bool,
+                        include_commit_details: bool) -> Optional[BranchInfo]:
+        """Enrich a single branch with unmerged commit info, or return None if merged."""
+        if base_sha and branch.sha:
+            # Compare the exact commits the cache key names, even if refs move meanwhile
+            key = (base_sha, branch.sha)
+            info = self._branch_info_cache.get(key)
+            if info is None:
+                info = self._branch_info_cache[key] = self._collect_branch_info(branch.sha, base_sha)
+        else:
+            info = self._collect_branch_info(branch.full_name)
+
+        # A single git log yields everything; keep only what the caller asked for
+        unmerged_count, contributors, commit_details = info
+        if unmerged_count == 0:
+            return None
+
+        branch.unmerged_commits = unmerged_count
+
+        # Hand out copies so callers cannot alter what is cached
+        if include_contributors:
+            branch.contributors = list(contributors)
+
+        if include_commit_details:
+            branch.commit_details = [dict(commit) for commit in commit_details]
+
+        return branch
+
+
+# Analyzer owned by each worker process of GitUnmerged._walk_in_processes
+_worker_analyzer: Optional[GitUnmerged] = None
+
+
+def _init_walk_worker(repo_path: str) -> None:
+    """Open the repository once per worker process."""
+    global _worker_analyzer
+    _worker_analyzer = GitUnmerged(repo_path)
+
+
+def _walk_in_worker(tip: str, base: str) -> Tuple[int, List[str], List[Dict]]:
+    """Collect branch info for tip against base inside a worker process."""
+    assert _worker_analyzer is not None, "worker not initialized by _init_walk_worker"
+    return _worker_analyzer._collect_branch_info(tip, base)
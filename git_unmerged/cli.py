@@ -1,15 +1,63 @@
 #!/usr/bin/env python3
 
 import argparse
-import csv
+import os
 import sys
-from io import StringIO
-from pathlib import Path
-from .analyzer import GitUnmerged, relative_date
+
+# Column layouts of the report tables, shared by each table's header and rows
+_BRANCH_ROW = "{:<50} {:<10} {:<40} {}".format
+_COMMIT_ROW = "  {:<10} {:<30} {:<26} {}".format
+
+# Printed after each run in --batch mode
+BATCH_SEPARATOR = "\0---\0"
+
+
+def _truncate(text: str, width: int) -> str:
+    """Shorten text to at most width characters, marking the cut with '...'."""
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for options that take a count of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _run_batch(stream) -> int:
+    """
+    Run one analysis per line of stream, each line holding the arguments of a
+    git-unmerged invocation. Every run's output is followed by BATCH_SEPARATOR on
+    a line of its own, so a caller can keep one process open for many runs.
+    Blank lines are skipped; a run that fails reports why on stderr and ends
+    only itself.
+    """
+    import shlex
+
+    for line in stream:
+        if not line.strip():
+            # Otherwise main([]) would analyze the current directory, fetch included
+            continue
+        try:
+            argv = shlex.split(line)
+            if '--batch' in argv:
+                raise ValueError("--batch cannot be nested")
+            main(argv)
+        except SystemExit:
+            # argparse and the repository checks have already said what was wrong
+            pass
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+        print(BATCH_SEPARATOR, flush=True)
+    return 0
 
 
-def main():
-    """Main CLI entry point."""
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
     parser = argparse.ArgumentParser(
         description="Analyze git branches to find unmerged commits",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -32,6 +80,9 @@ Examples:
 
   # Don't ignore any branches
   git-unmerged --ignore-pattern ""
+
+  # Analyze one branch at a time
+  git-unmerged --jobs 1
         """
     )
 
@@ -75,133 +126,186 @@ Examples:
         help='Show detailed commit information for each branch'
     )
 
-    parser.add_argument(
+    # Only one machine-readable format can go to stdout
+    output_format = parser.add_mutually_exclusive_group()
+
+    output_format.add_argument(
         '--csv',
         action='store_true',
         help='Output results in CSV format'
     )
 
+    output_format.add_argument(
+        '--json',
+        action='store_true',
+        help='Output results as JSON (commit details are included with --verbose)'
+    )
+
     parser.add_argument(
         '--absolute-date',
         action='store_true',
         help='Show dates in absolute format instead of relative (e.g., "2025-12-01" instead of "15 days ago")'
     )
 
+    parser.add_argument(
+        '--jobs',
+        type=_positive_int,
+        default=None,
+        help='Number of branches to analyze in parallel (default: based on CPU count; 1 disables parallelism)'
+    )
+
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Read one set of arguments per line from stdin and run each in turn, '
+             'printing a separator line after every run'
+    )
+
     parser.add_argument(
         '--version',
         action='version',
         version='%(prog)s 1.2.0'
     )
 
-    args = parser.parse_args()
+    return parser
 
-    # Validate repository path
-    repo_path = Path(args.repo).resolve()
-    if not repo_path.exists():
-        print(f"Error: Repository path does not exist: {repo_path}", file=sys.stderr)
-        sys.exit(1)
 
-    git_dir = repo_path / '.git'
-    if not git_dir.exists():
-        print(f"Error: Not a git repository: {repo_path}", file=sys.stderr)
+def main(argv=None):
+    """Main CLI entry point; argv defaults to the process arguments."""
+    args = build_parser().parse_args(argv)
+
+    if args.batch:
+        return _run_batch(sys.stdin)
+
+    # Validate repository path; one stat of .git (a directory, or a file in
+    # worktrees) settles the common case, the rest only picks the error message
+    try:
+        os.stat(os.path.join(args.repo, '.git'))
+    except OSError:
+        if not os.path.exists(args.repo):
+            print(f"Error: Repository path does not exist: {args.repo}", file=sys.stderr)
+        else:
+            print(f"Error: Not a git repository: {args.repo}", file=sys.stderr)
         sys.exit(1)
 
+    # Imported only once there is work to do, so --help, --version and bad
+    # paths return without loading the analyzer and its dependencies
+    from .analyzer import GitUnmerged, relative_date
+
     # Handle empty ignore pattern
     ignore_pattern = args.ignore_pattern if args.ignore_pattern else None
 
     # Create analyzer
     analyzer = GitUnmerged(
-        repo_path=str(repo_path),
+        repo_path=args.repo,
         base_branch=args.base_branch,
         ignore_pattern=ignore_pattern,
         days=args.days
     )
 
-    # Run analysis
-    if not args.no_fetch:
-        print("Fetching latest changes from remote...")
+    # Run analysis; progress messages would make JSON output unparseable
+    if not args.json:
+        if not args.no_fetch:
+            print("Fetching latest changes from remote...")
 
-    print(f"\nFinding branches with commits in the last {args.days} days...")
-    if ignore_pattern:
-        print(f"Ignoring branches containing: '{ignore_pattern}'")
+        print(f"\nFinding branches with commits in the last {args.days} days...")
+        if ignore_pattern:
+            print(f"Ignoring branches containing: '{ignore_pattern}'")
 
-    unmerged_branches = analyzer.analyze(
+    unmerged_branches = analyzer.analyze_branches(
         fetch=not args.no_fetch,
         include_contributors=True,
-        include_commit_details=args.verbose
+        include_commit_details=args.verbose,
+        max_workers=args.jobs
     )
 
     # Helper function to format date (relative by default, absolute with --absolute-date)
     def format_date(branch):
         if args.absolute_date:
-            return branch['date_str']
-        return relative_date(branch['date'])
+            return branch.date_str
+        return relative_date(branch.date)
 
     # Helper function to get contributors as string
     def get_contributors_str(branch):
-        if 'contributors' in branch and branch['contributors']:
-            names = [c.split('<')[0].strip() for c in branch['contributors']]
+        if branch.contributors:
+            names = [c.split('<')[0].strip() for c in branch.contributors]
             return ', '.join(names)
         return ""
 
-    if args.csv:
+    if args.json:
+        # JSON output mode
+        import json
+
+        branches = [
+            dict(branch.to_dict(), date=branch.date.isoformat())
+            for branch in unmerged_branches
+        ]
+        print(json.dumps({'branches': branches}, indent=2))
+    elif args.csv:
         # CSV output mode
+        import csv
+        from io import StringIO
+
         output = StringIO()
         writer = csv.writer(output)
         writer.writerow(['Branch Name', 'Commits', 'Contributors', 'Last Commit Date'])
         for branch in unmerged_branches:
             writer.writerow([
-                branch['name'],
-                branch['unmerged_commits'],
+                branch.name,
+                branch.unmerged_commits,
                 get_contributors_str(branch),
                 format_date(branch)
             ])
         print(output.getvalue(), end='')
     elif unmerged_branches:
-        print(f"\nFound {len(unmerged_branches)} branches NOT merged into {args.base_branch}:\n")
+        # Collect the report and write it in one go rather than one print per row
+        lines = [f"\nFound {len(unmerged_branches)} branches NOT merged into {args.base_branch}:\n"]
 
         if args.verbose:
             # Verbose mode: show detailed commit information
             for branch in unmerged_branches:
-                print(f"\n{'='*100}")
-                print(f"Branch: {branch['name']}")
-                print(f"Unmerged commits: {branch['unmerged_commits']}")
-                print(f"Last commit date: {format_date(branch)}")
+                lines.append(f"\n{'='*100}")
+                lines.append(f"Branch: {branch.name}")
+                lines.append(f"Unmerged commits: {branch.unmerged_commits}")
+                lines.append(f"Last commit date: {format_date(branch)}")
 
                 # Show contributors
-                if 'contributors' in branch and branch['contributors']:
-                    print(f"Contributors: {', '.join(branch['contributors'])}")
+                if branch.contributors:
+                    lines.append(f"Contributors: {', '.join(branch.contributors)}")
 
                 # Show detailed commits
-                if 'commit_details' in branch and branch['commit_details']:
-                    print(f"\nMissing commits against {args.base_branch}:")
-                    print(f"  {'Hash':<10} {'Author':<30} {'Date':<26} {'Subject'}")
-                    print(f"  {'-'*10} {'-'*30} {'-'*26} {'-'*40}")
-                    for commit in branch['commit_details']:
+                if branch.commit_details:
+                    lines.append(f"\nMissing commits against {args.base_branch}:")
+                    lines.append(_COMMIT_ROW('Hash', 'Author', 'Date', 'Subject'))
+                    lines.append(_COMMIT_ROW('-' * 10, '-' * 30, '-' * 26, '-' * 40))
+                    for commit in branch.commit_details:
                         author = f"{commit['author_name']} <{commit['author_email']}>"
-                        if len(author) > 30:
-                            author = author[:27] + "..."
-                        subject = commit['subject']
-                        if len(subject) > 40:
-                            subject = subject[:37] + "..."
-                        print(f"  {commit['hash']:<10} {author:<30} {commit['date']:<26} {subject}")
-
-            print(f"\n{'='*100}")
-            print(f"\nTotal unmerged branches: {len(unmerged_branches)}")
+                        lines.append(_COMMIT_ROW(
+                            commit['hash'],
+                            _truncate(author, 30),
+                            commit['date'],
+                            _truncate(commit['subject'], 40)
+                        ))
+
+            lines.append(f"\n{'='*100}")
+            lines.append(f"\nTotal unmerged branches: {len(unmerged_branches)}")
         else:
             # Default mode: show table with contributors
-            print(f"{'Branch Name':<50} {'Commits':<10} {'Contributors':<40} {'Last Commit Date'}")
-            print("-" * 140)
+            lines.append(_BRANCH_ROW('Branch Name', 'Commits', 'Contributors', 'Last Commit Date'))
+            lines.append("-" * 140)
 
-            # Print branches
+            # Add branches
             for branch in unmerged_branches:
-                contributors = get_contributors_str(branch)
-                if len(contributors) > 38:
-                    contributors = contributors[:35] + "..."
+                lines.append(_BRANCH_ROW(
+                    branch.name,
+                    branch.unmerged_commits,
+                    _truncate(get_contributors_str(branch), 38),
+                    format_date(branch)
+                ))
 
-                print(f"{branch['name']:<50} {branch['unmerged_commits']:<10} {contributors:<40} {format_date(branch)}")
+            lines.append(f"\n\nTotal unmerged branches: {len(unmerged_branches)}")
 
-            print(f"\n\nTotal unmerged branches: {len(unmerged_branches)}")
+        sys.stdout.write('\n'.join(lines) + '\n')
     else:
         print(f"\nFound {len(unmerged_branches)} branches NOT merged into {args.base_branch}:\n")
         print("No unmerged branches found.")
@@ -22,6 +22,9 @@ setup(
     packages=find_packages(),
     python_requires=">=3.7",
     install_requires=[],
+    extras_require={
+        'fast': ['pygit2>=1.14'],
+    },
     entry_points={
         'console_scripts': [
             'git-unmerged=git_unmerged.cli:main',
@@ -21,12 +21,18 @@ fi
 
 # Create test repository
 echo "Creating test repository..."
-git init "$TEST_REPO_PATH"
+# An empty template skips copying the sample hooks into the throwaway repository
+git init --template= "$TEST_REPO_PATH"
 cd "$TEST_REPO_PATH"
 
-# Configure git user for commits
-git config user.name "Test User"
-git config user.email "test@example.com"
+# Commit identity comes from the environment rather than git config, so
+# switching authors below costs no git process of its own
+as_author() {
+    export GIT_AUTHOR_NAME="$1" GIT_COMMITTER_NAME="$1"
+    export GIT_AUTHOR_EMAIL="$2" GIT_COMMITTER_EMAIL="$2"
+}
+
+as_author "Test User" "test@example.com"
 
 # Create initial commit on main branch
 echo "Creating initial commit on main..."
@@ -49,8 +55,7 @@ git add auth.txt
 git commit -m "Add user authentication"
 
 # Change author for second commit
-git config user.name "John Doe"
-git config user.email "john@example.com"
+as_author "John Doe" "john@example.com"
 echo "Password validation" >> auth.txt
 git add auth.txt
 git commit -m "Add password validation"
@@ -62,10 +67,8 @@ git commit -m "Implement JWT token support"
 
 # Create feature branch 2 with single author
 echo "Creating feature/database branch..."
-git checkout dev
-git checkout -b feature/database
-git config user.name "Jane Smith"
-git config user.email "jane@example.com"
+git checkout -b feature/database dev
+as_author "Jane Smith" "jane@example.com"
 echo "Database schema" > schema.sql
 git add schema.sql
 git commit -m "Add database schema"
@@ -76,20 +79,37 @@ git commit -m "Add migration support"
 
 # Create feature branch 3 with different author
 echo "Creating feature/api-endpoints branch..."
-git checkout dev
-git checkout -b feature/api-endpoints
-git config user.name "Bob Johnson"
-git config user.email "bob@example.com"
+git checkout -b feature/api-endpoints dev
+as_author "Bob Johnson" "bob@example.com"
 echo "API routes" > api.py
 git add api.py
 git commit -m "Add REST API endpoints"
 
+# Second author whose name and subject contain the '|' that output parsers
+# tend to split on; the subject also keeps a tab and a double space, and
+# spans two lines that git joins into one
+as_author "Pi|pe Guy" "pipe@example.com"
+echo "API pipes" >> api.py
+git add api.py
+git commit -m "$(printf 'Route a|b\trequests,  twice\nacross lines\n\nBody text')"
+
+# Control characters in a subject, which output parsers may also split on
+echo "API odd" >> api.py
+git add api.py
+git commit -m "$(printf 'odd\037subject')"
+
+# A branch whose name holds the '|' that ref listings tend to split on
+echo "Creating feature/pipe|name branch..."
+git checkout -b "feature/pipe|name" dev
+as_author "Test User" "test@example.com"
+echo "Pipe branch" > pipe.txt
+git add pipe.txt
+git commit -m "Add pipe branch file"
+
 # Create a branch that will be merged (no unmerged commits)
 echo "Creating and merging hotfix/bug-123 branch..."
-git checkout dev
-git checkout -b hotfix/bug-123
-git config user.name "Alice Brown"
-git config user.email "alice@example.com"
+git checkout -b hotfix/bug-123 dev
+as_author "Alice Brown" "alice@example.com"
 echo "Bug fix" > bugfix.txt
 git add bugfix.txt
 git commit -m "Fix critical bug #123"
@@ -100,7 +120,6 @@ git merge hotfix/bug-123 --no-edit
 
 # Set up remote tracking
 echo "Setting up remote tracking..."
-git checkout dev
 git remote add origin "$TEST_REPO_PATH"
 
 # Rename master to main if it exists
@@ -108,13 +127,16 @@ if git show-ref --verify --quiet refs/heads/master; then
     git branch -m master main
 fi
 
-# Create remote-tracking branches (simulate remote)
-git update-ref refs/remotes/origin/dev refs/heads/dev
-git update-ref refs/remotes/origin/main refs/heads/main
-git update-ref refs/remotes/origin/feature/user-auth refs/heads/feature/user-auth
-git update-ref refs/remotes/origin/feature/database refs/heads/feature/database
-git update-ref refs/remotes/origin/feature/api-endpoints refs/heads/feature/api-endpoints
-git update-ref refs/remotes/origin/hotfix/bug-123 refs/heads/hotfix/bug-123
+# Create remote-tracking branches (simulate remote) in one update-ref call
+git update-ref --stdin <<REFS
+update refs/remotes/origin/dev refs/heads/dev
+update refs/remotes/origin/main refs/heads/main
+update refs/remotes/origin/feature/user-auth refs/heads/feature/user-auth
+update refs/remotes/origin/feature/database refs/heads/feature/database
+update refs/remotes/origin/feature/api-endpoints refs/heads/feature/api-endpoints
+update refs/remotes/origin/feature/pipe|name refs/heads/feature/pipe|name
+update refs/remotes/origin/hotfix/bug-123 refs/heads/hotfix/bug-123
+REFS
 
 echo ""
 echo "Test repository created successfully at: $TEST_REPO_PATH"
@@ -124,7 +146,8 @@ echo "  - origin/main: 1 commit"
 echo "  - origin/dev: 2 commits (includes merged hotfix)"
 echo "  - origin/feature/user-auth: 3 unmerged commits (2 authors: Test User, John Doe)"
 echo "  - origin/feature/database: 2 unmerged commits (1 author: Jane Smith)"
-echo "  - origin/feature/api-endpoints: 1 unmerged commit (1 author: Bob Johnson)"
+echo "  - origin/feature/api-endpoints: 3 unmerged commits (2 authors: Bob Johnson, Pi|pe Guy)"
+echo "  - origin/feature/pipe|name: 1 unmerged commit (1 author: Test User)"
 echo "  - origin/hotfix/bug-123: Already merged into dev (0 unmerged)"
 echo ""
 echo "You can now run git-unmerged against this repository:"
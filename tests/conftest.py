@@ -0,0 +1,20 @@
+"""
+pytest configuration for the git-unmerged test suite.
+
+The test repository is built once by the controlling pytest process and handed
+to every test process through the environment, so the suite can be spread over
+pytest-xdist workers (pytest -n auto) without each worker creating its own.
+"""
+
+import os
+
+from .test_git_unmerged import TEST_REPO_ENV, _build_test_repo
+
+
+def pytest_sessionstart(session):
+    """Build the shared test repository before any xdist worker is started."""
+    # xdist workers inherit the variable from the controller, and a repository
+    # supplied by the caller is used as-is
+    if hasattr(session.config, 'workerinput') or os.environ.get(TEST_REPO_ENV):
+        return
+    os.environ[TEST_REPO_ENV] = _build_test_repo()
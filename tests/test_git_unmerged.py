@@ -4,14 +4,153 @@ Test suite for git-unmerged tool.
 Tests both the analyzer module and CLI functionality.
 """
 
+import atexit
+import contextlib
+import io
+import json
 import os
+import shlex
 import subprocess
-import tempfile
+import sys
 import unittest
+from types import SimpleNamespace
+from unittest import mock
 from pathlib import Path
 import shutil
 
-from git_unmerged.analyzer import GitUnmerged
+from git_unmerged.analyzer import BranchInfo, GitUnmerged, pygit2
+from git_unmerged.cli import BATCH_SEPARATOR, build_parser, main
+
+# The test repository is only ever read (tests that commit do so in an
+# isolated_worktree), so every test class (and every test process, when the
+# runner provides one through TEST_REPO_ENV) shares one copy
+TEST_REPO_ENV = 'GIT_UNMERGED_TEST_REPO'
+_SHARED_REPO = {'path': None}
+
+# Analyzers over the shared repository, keyed by ignore pattern; they only read
+# it, so one instance per configuration serves every test
+_ANALYZERS = {}
+
+
+def _remove_test_repo(path):
+    """Clean up the shared test repository at interpreter exit."""
+    if os.environ.get('KEEP_TEST_REPO'):
+        print(f"\nKeeping test repository: {path}")
+        return
+    if os.environ.get('CI'):
+        # The runner throws the whole machine away afterwards
+        return
+    if os.path.exists(path):
+        print(f"\nCleaning up test repository: {path}")
+        if os.name == 'nt':
+            # git writes its objects read-only; clear the flag on the whole tree
+            # in one attrib call rather than per file from an rmtree error handler
+            subprocess.run(['attrib', '-R', os.path.join(path, '*'), '/S', '/D'],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            shutil.rmtree(path)
+
+
+# Script that builds the test repository
+SETUP_SCRIPT = os.path.join(Path(__file__).parent.parent, 'test_setup.sh')
+
+# bash runs the setup script; looked up once, at import
+_BASH_CMD = shutil.which('bash') or next(
+    (path for path in ('/usr/bin/bash', '/bin/bash', 'C:\\Program Files\\Git\\bin\\bash.exe')
+     if os.path.exists(path)),
+    None
+)
+
+
+def to_unix_path(path):
+    """Convert a path to the form Git Bash expects; a no-op off Windows."""
+    if os.name != 'nt':
+        return path
+    unix_path = path.replace('\\', '/')
+    # Handle Windows drive letters (C:/ -> /c/)
+    if len(unix_path) > 1 and unix_path[1] == ':':
+        unix_path = '/' + unix_path[0].lower() + unix_path[2:]
+    return unix_path
+
+
+# Fields, and their types, that every analyzed branch and commit detail carries
+BRANCH_FIELDS = {'name': str, 'full_name': str, 'unmerged_commits': int, 'contributors': list}
+COMMIT_FIELDS = {'hash': str, 'author_name': str, 'author_email': str, 'subject': str, 'date': str}
+
+
+def run_main(*args):
+    """Run the CLI entry point in-process, returning its exit code and output."""
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            returncode = main(list(args))
+        except SystemExit as e:
+            returncode = e.code
+    return SimpleNamespace(returncode=returncode, stdout=stdout.getvalue(), stderr=stderr.getvalue())
+
+
+@contextlib.contextmanager
+def isolated_worktree(repo_path, commit='HEAD'):
+    """
+    Check out commit in a temporary linked worktree of repo_path, with a detached
+    HEAD, and yield its path. Tests that need to commit do so there: the shared
+    repository's branches and checkout are left as they were, and nothing is
+    cloned. Refs are shared between worktrees, so only HEAD may be moved.
+    """
+    import tempfile
+
+    worktree = tempfile.mkdtemp(prefix='git-unmerged-worktree-')
+    try:
+        subprocess.run(['git', '-C', repo_path, 'worktree', 'add', '--detach', worktree, commit],
+                       check=True, capture_output=True)
+        yield worktree
+    finally:
+        # Removing the worktree fails if adding it did, so the directory
+        # mkdtemp made is deleted either way
+        subprocess.run(['git', '-C', repo_path, 'worktree', 'remove', '--force', worktree],
+                       capture_output=True)
+        shutil.rmtree(worktree, ignore_errors=True)
+
+
+def _build_test_repo():
+    """Create the test repository in a new temporary directory and return its path."""
+    # Everything that can fail cheaply does so before a directory is created
+    if not os.path.exists(SETUP_SCRIPT):
+        raise FileNotFoundError(f"Setup script not found: {SETUP_SCRIPT}")
+    if not _BASH_CMD:
+        raise RuntimeError("bash executable not found")
+
+    # Fed to bash on stdin; read as bytes so no newline translation happens
+    # on the way in
+    with open(SETUP_SCRIPT, 'rb') as f:
+        script = f.read()
+
+    # Only needed when the repository is built here rather than handed over
+    import tempfile
+
+    repo_path = tempfile.mkdtemp(prefix='git-unmerged-test-')
+    print(f"\nSetting up test repository at: {repo_path}")
+
+    # Run the setup script
+    result = subprocess.run(
+        [_BASH_CMD, '-s', '--', to_unix_path(repo_path)],
+        input=script,
+        # Only stderr is of any use, and only on failure
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+
+    if result.returncode != 0:
+        stderr = result.stderr.decode(errors='replace')
+        print(f"Setup script stderr: {stderr}")
+        raise RuntimeError(f"Failed to set up test repository: {stderr}")
+
+    print(f"Test repository created successfully")
+
+    atexit.register(_remove_test_repo, repo_path)
+    return repo_path
 
 
 class TestGitUnmergedSetup(unittest.TestCase):
@@ -20,84 +159,64 @@ class TestGitUnmergedSetup(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up test repository once for all tests."""
-        cls.test_repo_path = tempfile.mkdtemp(prefix='git-unmerged-test-')
-
-        # Run the setup script
-        script_path = os.path.join(Path(__file__).parent.parent, 'test_setup.sh')
-        if not os.path.exists(script_path):
-            raise FileNotFoundError(f"Setup script not found: {script_path}")
-
-        print(f"\nSetting up test repository at: {cls.test_repo_path}")
-
-        # Convert Windows path to Unix-style path for Git Bash if on Windows
-        def to_unix_path(path):
-            """Convert Windows path to Unix-style path for Git Bash."""
-            unix_path = path.replace('\\', '/')
-            # Handle Windows drive letters (C:/ -> /c/)
-            if len(unix_path) > 1 and unix_path[1] == ':':
-                unix_path = '/' + unix_path[0].lower() + unix_path[2:]
-            return unix_path
-
-        script_path_unix = to_unix_path(script_path) if os.name == 'nt' else script_path
-        test_repo_path_unix = to_unix_path(cls.test_repo_path) if os.name == 'nt' else cls.test_repo_path
-
-        # Try to find bash executable
-        bash_cmd = shutil.which('bash')
-        if not bash_cmd:
-            # Try common locations
-            for bash_path in ['/usr/bin/bash', '/bin/bash', 'C:\\Program Files\\Git\\bin\\bash.exe']:
-                if os.path.exists(bash_path):
-                    bash_cmd = bash_path
-                    break
-
-        if not bash_cmd:
-            raise RuntimeError("bash executable not found")
+        if _SHARED_REPO['path'] is None:
+            # A runner that built the repository up front (see conftest.py)
+            # hands it over through the environment
+            _SHARED_REPO['path'] = os.environ.get(TEST_REPO_ENV) or _build_test_repo()
+        cls.test_repo_path = _SHARED_REPO['path']
 
-        result = subprocess.run(
-            [bash_cmd, script_path_unix, test_repo_path_unix],
-            capture_output=True,
-            text=True
-        )
-
-        if result.returncode != 0:
-            print(f"Setup script stdout: {result.stdout}")
-            print(f"Setup script stderr: {result.stderr}")
-            raise RuntimeError(f"Failed to set up test repository: {result.stderr}")
-
-        print(f"Test repository created successfully")
+    @classmethod
+    def _analyzer(cls, ignore_pattern=None):
+        """Return the shared analyzer over the test repository for ignore_pattern."""
+        analyzer = _ANALYZERS.get(ignore_pattern)
+        if analyzer is None:
+            analyzer = _ANALYZERS[ignore_pattern] = GitUnmerged(
+                repo_path=cls.test_repo_path,
+                base_branch='origin/dev',
+                ignore_pattern=ignore_pattern,
+                days=365
+            )
+        return analyzer
 
     @classmethod
-    def tearDownClass(cls):
-        """Clean up test repository after all tests."""
-        if hasattr(cls, 'test_repo_path') and os.path.exists(cls.test_repo_path):
-            print(f"\nCleaning up test repository: {cls.test_repo_path}")
-            # On Windows, git files may be read-only, so we need to handle permissions
-            def handle_remove_readonly(func, path, exc):
-                """Error handler for Windows readonly files."""
-                if os.name == 'nt':
-                    os.chmod(path, 0o777)
-                    func(path)
-                else:
-                    raise
-
-            shutil.rmtree(cls.test_repo_path, onerror=handle_remove_readonly)
+    def _fresh_analyzer(cls, repo_path=None):
+        """Return a new analyzer, with an empty cache, over repo_path (default: the test repository)."""
+        return GitUnmerged(
+            repo_path=repo_path or cls.test_repo_path,
+            base_branch='origin/dev',
+            ignore_pattern=None,
+            days=365
+        )
 
 
 class TestGitUnmergedAnalyzer(TestGitUnmergedSetup):
     """Test the GitUnmerged analyzer class."""
 
-    def setUp(self):
-        """Set up analyzer for each test."""
-        self.analyzer = GitUnmerged(
-            repo_path=self.test_repo_path,
-            base_branch='origin/dev',
-            ignore_pattern=None,
-            days=365
+    @classmethod
+    def setUpClass(cls):
+        """Run the default and the fullest analysis once for the tests to share."""
+        super().setUpClass()
+        analyzer = cls._analyzer()
+        cls._basic = analyzer.analyze(fetch=False)
+        cls._full = analyzer.analyze(
+            fetch=False,
+            include_contributors=True,
+            include_commit_details=True
         )
 
+    def assertFields(self, records, fields):
+        """Assert that every record has each of fields, holding a value of its type."""
+        problems = [
+            (record.get('name', record.get('hash')), field)
+            for record in records
+            for field, field_type in fields.items()
+            if not isinstance(record.get(field), field_type)
+        ]
+        self.assertEqual(problems, [], "records with missing or mistyped fields")
+
     def test_get_recent_branches(self):
         """Test that we can get recent branches."""
-        branches = self.analyzer.get_recent_branches()
+        branches = self._analyzer().get_recent_branches()
         self.assertIsInstance(branches, list)
         self.assertGreater(len(branches), 0, "Should find at least one branch")
 
@@ -109,7 +228,7 @@ class TestGitUnmergedAnalyzer(TestGitUnmergedSetup):
 
     def test_analyze_without_fetch(self):
         """Test basic analysis without fetching."""
-        unmerged_branches = self.analyzer.analyze(fetch=False)
+        unmerged_branches = self._basic
 
         self.assertIsInstance(unmerged_branches, list)
         # Should have 3 unmerged branches: user-auth, database, api-endpoints
@@ -118,25 +237,21 @@ class TestGitUnmergedAnalyzer(TestGitUnmergedSetup):
                                "Should find at least 3 unmerged branches")
 
         # Check that each branch has required fields
+        self.assertFields(unmerged_branches, BRANCH_FIELDS)
         for branch in unmerged_branches:
-            self.assertIn('name', branch)
-            self.assertIn('unmerged_commits', branch)
             self.assertGreater(branch['unmerged_commits'], 0)
+            # Commit details are only collected on request
+            self.assertNotIn('commit_details', branch)
 
     def test_contributors_included(self):
         """Test that contributors are included in analysis."""
-        unmerged_branches = self.analyzer.analyze(
-            fetch=False,
-            include_contributors=True
-        )
+        unmerged_branches = self._basic
 
         self.assertGreater(len(unmerged_branches), 0, "Should find unmerged branches")
 
         # Check that contributors are included
+        self.assertFields(unmerged_branches, BRANCH_FIELDS)
         for branch in unmerged_branches:
-            self.assertIn('contributors', branch)
-            self.assertIsInstance(branch['contributors'], list)
-
             # At least one contributor per branch
             if branch['unmerged_commits'] > 0:
                 self.assertGreater(len(branch['contributors']), 0,
@@ -144,37 +259,27 @@ class TestGitUnmergedAnalyzer(TestGitUnmergedSetup):
 
     def test_commit_details_included(self):
         """Test that detailed commit information is included when requested."""
-        unmerged_branches = self.analyzer.analyze(
-            fetch=False,
-            include_commit_details=True
-        )
+        unmerged_branches = self._full
 
         self.assertGreater(len(unmerged_branches), 0, "Should find unmerged branches")
 
         # Check that commit details are included
+        self.assertFields(unmerged_branches, dict(BRANCH_FIELDS, commit_details=list))
         for branch in unmerged_branches:
-            self.assertIn('commit_details', branch)
-            self.assertIsInstance(branch['commit_details'], list)
-
             # Number of commit details should match unmerged count
             self.assertEqual(len(branch['commit_details']),
                            branch['unmerged_commits'],
                            f"Branch {branch['name']} commit count mismatch")
 
-            # Verify commit detail structure
-            for commit in branch['commit_details']:
-                self.assertIn('hash', commit)
-                self.assertIn('author_name', commit)
-                self.assertIn('author_email', commit)
-                self.assertIn('subject', commit)
-                self.assertIn('date', commit)
+        # Verify commit detail structure
+        self.assertFields(
+            [commit for branch in unmerged_branches for commit in branch['commit_details']],
+            COMMIT_FIELDS
+        )
 
     def test_specific_branches(self):
         """Test that specific expected branches are found."""
-        unmerged_branches = self.analyzer.analyze(
-            fetch=False,
-            include_contributors=True
-        )
+        unmerged_branches = self._basic
 
         branch_names = [b['name'] for b in unmerged_branches]
 
@@ -182,17 +287,14 @@ class TestGitUnmergedAnalyzer(TestGitUnmergedSetup):
         self.assertIn('feature/user-auth', branch_names)
         self.assertIn('feature/database', branch_names)
         self.assertIn('feature/api-endpoints', branch_names)
+        self.assertIn('feature/pipe|name', branch_names)
 
         # hotfix/bug-123 is merged, so it should NOT appear
         self.assertNotIn('hotfix/bug-123', branch_names)
 
     def test_user_auth_branch_details(self):
         """Test specific details of the feature/user-auth branch."""
-        unmerged_branches = self.analyzer.analyze(
-            fetch=False,
-            include_contributors=True,
-            include_commit_details=True
-        )
+        unmerged_branches = self._full
 
         # Find the user-auth branch
         user_auth = next(
@@ -212,28 +314,171 @@ class TestGitUnmergedAnalyzer(TestGitUnmergedSetup):
         self.assertIn('Test User', contributor_names)
         self.assertIn('John Doe', contributor_names)
 
+    def test_separator_characters_in_commit_fields(self):
+        """Test that separator-like characters in author names and subjects do not shift other fields."""
+        api = next(b for b in self._full if b['name'] == 'feature/api-endpoints')
+
+        # Every commit is counted, whatever its subject holds
+        self.assertEqual(api['unmerged_commits'], 3)
+        self.assertEqual(api['unmerged_commits'],
+                         self._analyzer().get_unmerged_commits('origin/feature/api-endpoints'))
+        self.assertIn('Pi|pe Guy <pipe@example.com>', api['contributors'])
+
+        odd, pipe = api['commit_details'][:2]
+        self.assertEqual(odd['subject'], 'odd\x1fsubject')
+        self.assertEqual(pipe['author_name'], 'Pi|pe Guy')
+        self.assertEqual(pipe['author_email'], 'pipe@example.com')
+        self.assertEqual(pipe['subject'], 'Route a|b\trequests,  twice across lines')
+
+    def test_analyze_branches_matches_analyze(self):
+        """Test that BranchInfo records carry the same data as the dictionaries."""
+        analyzer = self._analyzer()
+        records = analyzer.analyze_branches(fetch=False)
+
+        for record in records:
+            self.assertIsInstance(record, BranchInfo)
+            self.assertIsNone(record.commit_details)
+
+        self.assertEqual([record.to_dict() for record in records],
+                         analyzer.analyze(fetch=False))
+
+    def test_parallel_matches_serial(self):
+        """Test that processing branches concurrently reports the same as one at a time."""
+        serial = self._fresh_analyzer().analyze(fetch=False, include_commit_details=True, max_workers=1)
+        parallel = self._fresh_analyzer().analyze(fetch=False, include_commit_details=True, max_workers=4)
+
+        self.assertEqual(serial, parallel)
+        self.assertEqual(serial, self._full)
+
+    def test_analyze_with_fetch(self):
+        """Test that analysis after a background fetch matches the local analysis."""
+        import tempfile
+
+        # Fetching with --prune rewrites remote-tracking refs, so it runs in a
+        # clone rather than the shared repository. The clone's origin is the
+        # fixture, whose branches match its remote-tracking ones, so the
+        # fetch is local and leaves every branch where the fixture has it.
+        clone = tempfile.mkdtemp(prefix='git-unmerged-clone-')
+        self.addCleanup(shutil.rmtree, clone, ignore_errors=True)
+        subprocess.run(['git', 'clone', '--quiet', self.test_repo_path, clone],
+                       check=True, capture_output=True)
+
+        analyzer = self._fresh_analyzer(clone)
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            fetched = analyzer.analyze(fetch=True, include_commit_details=True)
+
+        self.assertEqual(stderr.getvalue(), '')
+        self.assertEqual(fetched, self._full)
+
+    def test_analyze_with_failing_fetch(self):
+        """Test that a failed fetch is reported and the local branches are still analyzed."""
+        analyzer = self._fresh_analyzer()
+        # Rewrite origin's URL to somewhere unreachable for this process's git
+        # calls only, without touching the shared repository's config
+        origin_url = subprocess.run(
+            ['git', '-C', self.test_repo_path, 'config', 'remote.origin.url'],
+            check=True, capture_output=True, text=True
+        ).stdout.strip()
+        unreachable_origin = {
+            'GIT_CONFIG_COUNT': '1',
+            'GIT_CONFIG_KEY_0': f'url.{origin_url}/no-such-remote.insteadOf',
+            'GIT_CONFIG_VALUE_0': origin_url,
+        }
+        stderr = io.StringIO()
+        with mock.patch.dict(os.environ, unreachable_origin), contextlib.redirect_stderr(stderr):
+            result = analyzer.analyze(fetch=True, include_commit_details=True)
+
+        self.assertIn('Warning: fetching from origin failed', stderr.getvalue())
+        self.assertEqual(result, self._full)
+
+        # fetch_remote reports failures for whichever remote it was given
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            analyzer.fetch_remote(remote='no-such-remote')
+        self.assertIn('Warning: fetching from no-such-remote failed', stderr.getvalue())
+
+    def test_invalid_max_workers(self):
+        """Test that a worker count below 1 is rejected rather than taken as the default."""
+        for max_workers in (0, -1):
+            with self.assertRaises(ValueError):
+                self._analyzer().analyze(fetch=False, max_workers=max_workers)
+
+    def test_repeat_analysis_uses_cache(self):
+        """Test that re-analyzing unchanged branches does not walk history again."""
+        analyzer = self._analyzer()
+        first = analyzer.analyze(fetch=False, include_commit_details=True)
+
+        with mock.patch.object(analyzer, '_collect_branch_info',
+                               side_effect=AssertionError("cache not used")):
+            second = analyzer.analyze(fetch=False, include_commit_details=True)
+
+        self.assertEqual(first, second)
+
+    def test_cache_drops_entries_for_old_base(self):
+        """Test that moving the base branch evicts cache entries computed against the old one."""
+        analyzer = self._fresh_analyzer()
+        analyzer.base_branch = 'origin/main'
+        analyzer.analyze(fetch=False)
+
+        analyzer.base_branch = 'origin/dev'
+        analyzer.analyze(fetch=False)
+
+        dev_sha = analyzer._resolve_commit('origin/dev')
+        self.assertTrue(analyzer._branch_info_cache)
+        self.assertEqual({base for base, _ in analyzer._branch_info_cache}, {dev_sha})
+
+    @unittest.skipIf(pygit2 is None, "pygit2 is not installed")
+    def test_pygit2_matches_git_cli(self):
+        """Test that the pygit2 backend reports the same as the git CLI backend."""
+        analyzer = self._analyzer()
+        self.assertTrue(analyzer._use_pygit2)
+        via_pygit2 = analyzer.analyze(fetch=False, include_commit_details=True)
+
+        cli_analyzer = self._fresh_analyzer()
+        cli_analyzer._use_pygit2 = False
+        via_cli = cli_analyzer.analyze(fetch=False, include_commit_details=True)
+
+        self.assertEqual(via_pygit2, via_cli)
+
+    @unittest.skipIf(pygit2 is None, "pygit2 is not installed")
+    def test_process_pool_matches_serial(self):
+        """Test that walking branches in worker processes reports the same as walking them inline."""
+        serial = self._fresh_analyzer().analyze(fetch=False, include_commit_details=True, max_workers=1)
+
+        # The fixture has far fewer branches than the threshold, so lower it. The
+        # walks must then all happen in the workers, leaving none for this process.
+        analyzer = self._fresh_analyzer()
+        with mock.patch('git_unmerged.analyzer._PROCESS_POOL_MIN_BRANCHES', 1), \
+                mock.patch.object(analyzer, '_collect_branch_info',
+                                  side_effect=AssertionError("walked outside the process pool")):
+            pooled = analyzer.analyze(fetch=False, include_commit_details=True, max_workers=2)
+
+        self.assertEqual(pooled, serial)
+
 
 class TestGitUnmergedCLI(TestGitUnmergedSetup):
     """Test the CLI functionality."""
 
-    def run_cli(self, *args):
-        """Helper method to run the CLI and capture output."""
-        cmd = ['git-unmerged', '--repo', self.test_repo_path] + list(args)
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True
-        )
-        return result
+    # Arguments shared by the CLI runs below
+    CLI_ARGS = ('--base-branch', 'origin/dev', '--ignore-pattern', '', '--no-fetch', '--days', '365')
+
+    @classmethod
+    def setUpClass(cls):
+        """Run the CLI once in default and once in verbose mode for the tests to share."""
+        super().setUpClass()
+        cls._cli_default = cls.run_cli(*cls.CLI_ARGS)
+        cls._cli_verbose = cls.run_cli(*cls.CLI_ARGS, '--verbose')
+        cls._cli_json = cls.run_cli(*cls.CLI_ARGS, '--verbose', '--json')
+
+    @classmethod
+    def run_cli(cls, *args):
+        """Helper method to run the CLI against the test repository and capture output."""
+        return run_main('--repo', cls.test_repo_path, *args)
 
     def test_cli_basic_run(self):
         """Test basic CLI execution."""
-        result = self.run_cli(
-            '--base-branch', 'origin/dev',
-            '--ignore-pattern', '',
-            '--no-fetch',
-            '--days', '365'
-        )
+        result = self._cli_default
 
         self.assertEqual(result.returncode, 0,
                         f"CLI should exit successfully. Error: {result.stderr}")
@@ -242,12 +487,7 @@ class TestGitUnmergedCLI(TestGitUnmergedSetup):
 
     def test_cli_default_mode_shows_contributors(self):
         """Test that default mode shows contributors in output."""
-        result = self.run_cli(
-            '--base-branch', 'origin/dev',
-            '--ignore-pattern', '',
-            '--no-fetch',
-            '--days', '365'
-        )
+        result = self._cli_default
 
         self.assertEqual(result.returncode, 0)
 
@@ -262,13 +502,7 @@ class TestGitUnmergedCLI(TestGitUnmergedSetup):
 
     def test_cli_verbose_mode(self):
         """Test that verbose mode shows detailed commit information."""
-        result = self.run_cli(
-            '--base-branch', 'origin/dev',
-            '--ignore-pattern', '',
-            '--no-fetch',
-            '--days', '365',
-            '--verbose'
-        )
+        result = self._cli_verbose
 
         self.assertEqual(result.returncode, 0)
 
@@ -287,33 +521,86 @@ class TestGitUnmergedCLI(TestGitUnmergedSetup):
         self.assertIn('Add database schema', result.stdout)
         self.assertIn('Add REST API endpoints', result.stdout)
 
+    def test_cli_json_output(self):
+        """Test that JSON mode reports the same branches as structured data."""
+        result = self._cli_json
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        branches = {b['name']: b for b in json.loads(result.stdout)['branches']}
+
+        self.assertEqual(set(branches), {'feature/user-auth', 'feature/database', 'feature/api-endpoints', 'feature/pipe|name'})
+        self.assertEqual(branches['feature/user-auth']['unmerged_commits'], 3)
+        self.assertEqual(
+            {c.split('<')[0].strip() for c in branches['feature/user-auth']['contributors']},
+            {'Test User', 'John Doe'}
+        )
+        self.assertIn('Add database schema',
+                      [c['subject'] for c in branches['feature/database']['commit_details']])
+
+        # Dates are serialized, and match what the analyzer reports
+        self.assertEqual(
+            [dict(b, date=b['date'].isoformat()) for b in self._analyzer().analyze(
+                fetch=False, include_commit_details=True)],
+            json.loads(result.stdout)['branches']
+        )
+
     def test_cli_help(self):
         """Test that help flag works."""
-        result = subprocess.run(
-            ['git-unmerged', '--help'],
-            capture_output=True,
-            text=True
-        )
+        result = run_main('--help')
 
         self.assertEqual(result.returncode, 0)
         self.assertIn('--verbose', result.stdout,
                      "Help should mention --verbose flag")
         self.assertIn('Show detailed commit information', result.stdout)
+        self.assertEqual(result.stdout, build_parser().format_help())
+
+    def test_cli_batch_mode(self):
+        """Test that --batch runs each stdin line as an invocation in one process."""
+        lines = [
+            shlex.join(['--repo', self.test_repo_path, *self.CLI_ARGS]),
+            shlex.join(['--repo', self.test_repo_path, *self.CLI_ARGS, '--verbose']),
+        ]
+        result = subprocess.run(
+            [sys.executable, '-m', 'git_unmerged.cli', '--batch'],
+            input='\n'.join(lines) + '\n',
+            capture_output=True,
+            text=True
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        outputs = result.stdout.split(BATCH_SEPARATOR + '\n')
+        self.assertEqual(outputs, [self._cli_default.stdout, self._cli_verbose.stdout, ''])
+
+    def test_cli_batch_mode_bad_lines(self):
+        """Test that --batch skips blank lines and outlives runs that fail."""
+        stdin = io.StringIO(
+            '\n'
+            '   \n'
+            '--batch\n'
+            '--repo "unterminated\n'
+            + shlex.join(['--repo', self.test_repo_path, *self.CLI_ARGS]) + '\n'
+            '\n'
+        )
+        with mock.patch('sys.stdin', stdin):
+            result = run_main('--batch')
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        outputs = result.stdout.split(BATCH_SEPARATOR + '\n')
+        self.assertEqual(outputs, ['', '', self._cli_default.stdout, ''])
+        self.assertIn('--batch cannot be nested', result.stderr)
+        self.assertIn('No closing quotation', result.stderr)
 
     def test_cli_ignores_merged_branches(self):
         """Test that merged branches are not shown."""
-        result = self.run_cli(
-            '--base-branch', 'origin/dev',
-            '--ignore-pattern', '',
-            '--no-fetch',
-            '--days', '365'
-        )
+        for result in (self._cli_default, self._cli_verbose):
+            self.assertEqual(result.returncode, 0)
 
-        self.assertEqual(result.returncode, 0)
+            # hotfix/bug-123 was merged, should not appear
+            self.assertNotIn('hotfix/bug-123', result.stdout,
+                            "Merged branch should not appear in output")
 
-        # hotfix/bug-123 was merged, should not appear
-        self.assertNotIn('hotfix/bug-123', result.stdout,
-                        "Merged branch should not appear in output")
+        branch_names = [b['name'] for b in json.loads(self._cli_json.stdout)['branches']]
+        self.assertNotIn('hotfix/bug-123', branch_names)
 
 
 class TestGitUnmergedEdgeCases(TestGitUnmergedSetup):
@@ -321,26 +608,30 @@ class TestGitUnmergedEdgeCases(TestGitUnmergedSetup):
 
     def test_invalid_repo_path(self):
         """Test handling of invalid repository path."""
-        result = subprocess.run(
-            ['git-unmerged', '--repo', '/nonexistent/path', '--no-fetch'],
-            capture_output=True,
-            text=True
-        )
+        result = run_main('--repo', '/nonexistent/path', '--no-fetch')
 
         self.assertNotEqual(result.returncode, 0,
                           "Should fail with invalid repo path")
         self.assertIn('does not exist', result.stderr)
 
+    def test_invalid_jobs(self):
+        """Test that --jobs below 1 is a usage error."""
+        for jobs in ('0', '-1'):
+            result = run_main('--repo', self.test_repo_path, '--no-fetch', '--jobs', jobs)
+
+            self.assertEqual(result.returncode, 2)
+            self.assertIn('--jobs: must be at least 1', result.stderr)
+
+    def test_json_and_csv_conflict(self):
+        """Test that --json and --csv cannot be combined."""
+        result = run_main('--repo', self.test_repo_path, '--no-fetch', '--json', '--csv')
+
+        self.assertEqual(result.returncode, 2)
+        self.assertIn('not allowed with argument', result.stderr)
+
     def test_ignore_pattern(self):
         """Test branch ignore pattern functionality."""
-        analyzer = GitUnmerged(
-            repo_path=self.test_repo_path,
-            base_branch='origin/dev',
-            ignore_pattern='hotfix',
-            days=365
-        )
-
-        unmerged_branches = analyzer.analyze(fetch=False)
+        unmerged_branches = self._analyzer(ignore_pattern='hotfix').analyze(fetch=False)
         branch_names = [b['name'] for b in unmerged_branches]
 
         # hotfix branches should be ignored
@@ -348,6 +639,35 @@ class TestGitUnmergedEdgeCases(TestGitUnmergedSetup):
             self.assertNotIn('hotfix', name,
                            f"Branch {name} should be ignored by pattern")
 
+    def test_analyze_detached_worktree(self):
+        """Test analysis from a linked worktree against a commit that is not on any branch."""
+        # Identity for the merge commit, independent of the user's git config
+        env = dict(os.environ,
+                   GIT_AUTHOR_NAME='Test User', GIT_AUTHOR_EMAIL='test@example.com',
+                   GIT_COMMITTER_NAME='Test User', GIT_COMMITTER_EMAIL='test@example.com')
+
+        with isolated_worktree(self.test_repo_path, 'origin/dev') as worktree:
+            subprocess.run(['git', '-C', worktree, 'merge', '--no-edit', 'origin/feature/database'],
+                           check=True, capture_output=True, env=env)
+
+            # The worktree's .git is a file, which the CLI must accept too
+            result = run_main('--repo', worktree, '--base-branch', 'HEAD', '--ignore-pattern', '',
+                              '--no-fetch', '--days', '365')
+            self.assertEqual(result.returncode, 0, result.stderr)
+
+            analyzer = GitUnmerged(repo_path=worktree, base_branch='HEAD', ignore_pattern=None, days=365)
+            branch_names = [b['name'] for b in analyzer.analyze(fetch=False)]
+
+        # Merged on the worktree's HEAD only
+        self.assertNotIn('feature/database', branch_names)
+        self.assertNotIn('feature/database', result.stdout)
+        self.assertIn('feature/user-auth', branch_names)
+        self.assertIn('feature/api-endpoints', branch_names)
+
+        # The shared repository still sees the branch as unmerged
+        shared_names = [b['name'] for b in self._analyzer().analyze(fetch=False)]
+        self.assertIn('feature/database', shared_names)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)